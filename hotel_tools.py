@@ -0,0 +1,375 @@
+import os
+import sys
+import bisect
+import functools
+import orjson
+from langchain_core.tools import tool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from typing import List, Dict, Any
+
+# Sample hotel data for 5 locations
+HOTEL_DATA = {
+    "new_york": [
+        {
+            "name": "The Plaza Hotel",
+            "rating": 4.5,
+            "price_per_night": 450,
+            "amenities": ["WiFi", "Pool", "Spa", "Gym", "Restaurant"],
+            "availability": True
+        },
+        {
+            "name": "The Standard High Line",
+            "rating": 4.2,
+            "price_per_night": 320,
+            "amenities": ["WiFi", "Bar", "Gym", "Pet-friendly"],
+            "availability": True
+        },
+        {
+            "name": "Pod Hotel Brooklyn",
+            "rating": 4.0,
+            "price_per_night": 180,
+            "amenities": ["WiFi", "Restaurant", "Rooftop Bar"],
+            "availability": False
+        }
+    ],
+    "paris": [
+        {
+            "name": "Hotel Plaza Athenee",
+            "rating": 4.8,
+            "price_per_night": 680,
+            "amenities": ["WiFi", "Spa", "Restaurant", "Concierge", "Bar"],
+            "availability": True
+        },
+        {
+            "name": "Le Marais Hotel",
+            "rating": 4.1,
+            "price_per_night": 280,
+            "amenities": ["WiFi", "Restaurant", "Historic Building"],
+            "availability": True
+        },
+        {
+            "name": "Hotel des Grands Boulevards",
+            "rating": 4.3,
+            "price_per_night": 350,
+            "amenities": ["WiFi", "Restaurant", "Bar", "Garden"],
+            "availability": True
+        }
+    ],
+    "tokyo": [
+        {
+            "name": "The Ritz-Carlton Tokyo",
+            "rating": 4.7,
+            "price_per_night": 520,
+            "amenities": ["WiFi", "Spa", "Pool", "Multiple Restaurants", "City View"],
+            "availability": True
+        },
+        {
+            "name": "Shibuya Excel Hotel Tokyu",
+            "rating": 4.2,
+            "price_per_night": 290,
+            "amenities": ["WiFi", "Restaurant", "City Center", "Shopping Access"],
+            "availability": True
+        },
+        {
+            "name": "Capsule Hotel Shinjuku 510",
+            "rating": 3.8,
+            "price_per_night": 80,
+            "amenities": ["WiFi", "Shared Bath", "Lockers"],
+            "availability": False
+        }
+    ],
+    "london": [
+        {
+            "name": "The Savoy",
+            "rating": 4.6,
+            "price_per_night": 590,
+            "amenities": ["WiFi", "Spa", "Multiple Restaurants", "Theatre District", "River View"],
+            "availability": True
+        },
+        {
+            "name": "Premier Inn London City",
+            "rating": 4.0,
+            "price_per_night": 120,
+            "amenities": ["WiFi", "Restaurant", "24/7 Reception"],
+            "availability": True
+        },
+        {
+            "name": "The Zetter Townhouse",
+            "rating": 4.4,
+            "price_per_night": 380,
+            "amenities": ["WiFi", "Bar", "Boutique Style", "Historic"],
+            "availability": True
+        }
+    ],
+    "dubai": [
+        {
+            "name": "Burj Al Arab Jumeirah",
+            "rating": 4.9,
+            "price_per_night": 1200,
+            "amenities": ["WiFi", "Multiple Pools", "Spa", "Private Beach", "Butler Service"],
+            "availability": True
+        },
+        {
+            "name": "Atlantis The Palm",
+            "rating": 4.5,
+            "price_per_night": 480,
+            "amenities": ["WiFi", "Water Park", "Aquarium", "Multiple Restaurants", "Beach"],
+            "availability": True
+        },
+        {
+            "name": "Rove Downtown Dubai",
+            "rating": 4.1,
+            "price_per_night": 150,
+            "amenities": ["WiFi", "Pool", "Gym", "Restaurant", "City Center"],
+            "availability": False
+        }
+    ]
+}
+
+# Intern amenity names so each repeated amenity is a single shared string
+for hotels in HOTEL_DATA.values():
+    for hotel in hotels:
+        hotel["amenities"] = [sys.intern(amenity) for amenity in hotel["amenities"]]
+
+# Shared amenity legend; search_hotels_compact encodes amenities as bitmasks
+# over it, bit i standing for AMENITY_VOCAB[i]
+AMENITY_VOCAB = sorted({
+    amenity for hotels in HOTEL_DATA.values() for hotel in hotels for amenity in hotel["amenities"]
+})
+_AMENITY_BITS = {amenity: 1 << i for i, amenity in enumerate(AMENITY_VOCAB)}
+
+# Lookup indexes built once at import so the tools avoid per-call scans
+HOTEL_NAME_INDEX = {
+    location: {hotel["name"].lower(): hotel for hotel in hotels}
+    for location, hotels in HOTEL_DATA.items()
+}
+AVAILABLE_BY_LOCATION = {
+    location: [hotel for hotel in hotels if hotel["availability"]]
+    for location, hotels in HOTEL_DATA.items()
+}
+PRICE_SORTED = {
+    location: sorted(hotels, key=lambda hotel: hotel["price_per_night"])
+    for location, hotels in AVAILABLE_BY_LOCATION.items()
+}
+# Parallel price lists for bisecting PRICE_SORTED on max_price
+_SORTED_PRICES = {
+    location: [hotel["price_per_night"] for hotel in hotels]
+    for location, hotels in PRICE_SORTED.items()
+}
+
+
+def _compact_hotel(hotel: Dict[str, Any]) -> Dict[str, Any]:
+    # Available hotel with amenities replaced by their AMENITY_VOCAB bitmask
+    return {
+        **{key: value for key, value in hotel.items() if key not in ("amenities", "availability")},
+        "amenities_mask": sum(_AMENITY_BITS[amenity] for amenity in hotel["amenities"])
+    }
+
+
+# Compact records parallel to AVAILABLE_BY_LOCATION and PRICE_SORTED
+_COMPACT_AVAILABLE = {
+    location: [_compact_hotel(hotel) for hotel in hotels]
+    for location, hotels in AVAILABLE_BY_LOCATION.items()
+}
+_COMPACT_PRICE_SORTED = {
+    location: [_compact_hotel(hotel) for hotel in hotels]
+    for location, hotels in PRICE_SORTED.items()
+}
+
+
+def get_llm():
+    # The chat model stack is imported only when an LLM is actually needed
+    from langchain.chat_models import init_chat_model
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise EnvironmentError("OPENAI_API_KEY not set.")
+    _install_llm_cache()
+    return init_chat_model("openai:gpt-4.1")
+
+
+@functools.lru_cache(maxsize=1)
+def _install_llm_cache():
+    # Cache completions for identical (model, messages, tools) requests across runs.
+    # For near-duplicate queries, a semantic cache such as GPTCache or
+    # RedisSemanticCache can be swapped in here.
+    from langchain_core.globals import set_llm_cache
+    from langchain_community.cache import SQLiteCache
+    from sqlalchemy.exc import IntegrityError
+
+    class _ConcurrentSQLiteCache(SQLiteCache):
+        # Identical prompts in flight together all miss the cache and then race
+        # to insert the same row; the loser's completion is already stored, so
+        # treat its failed insert as a cache hit
+        def update(self, prompt, llm_string, return_val):
+            try:
+                super().update(prompt, llm_string, return_val)
+            except IntegrityError:
+                pass
+
+    set_llm_cache(_ConcurrentSQLiteCache(database_path=".hotel_llm_cache.db"))
+
+
+@tool
+def search_hotels(location: str, max_price: int = None) -> List[Dict[str, Any]]:
+    """
+    Search for available hotels in a specific location.
+
+    Args:
+        location: The city/location to search for hotels (e.g., 'new_york', 'paris', 'tokyo', 'london', 'dubai')
+        max_price: Optional maximum price per night filter
+
+    Returns:
+        List of available hotels with details
+    """
+    location_key = location.lower().replace(" ", "_")
+
+    if location_key not in HOTEL_DATA:
+        return {
+            "error": f"No hotels found for location: {location}. Available locations: {', '.join(HOTEL_DATA.keys())}"
+        }
+
+    available_hotels = _select_available(location_key, max_price, AVAILABLE_BY_LOCATION, PRICE_SORTED)
+
+    return {
+        "location": location,
+        "total_available": len(available_hotels),
+        "hotels": available_hotels
+    }
+
+
+def search_hotels_compact(location: str, max_price: int = None) -> Dict[str, Any]:
+    """
+    Search for available hotels, encoding amenities as bitmasks.
+
+    Same results as search_hotels, but each hotel carries an amenities_mask
+    over the shared amenity_legend instead of its amenity list. Not exposed
+    as a tool.
+
+    Args:
+        location: The city/location to search for hotels
+        max_price: Optional maximum price per night filter
+
+    Returns:
+        Available hotels with the amenity legend
+    """
+    location_key = location.lower().replace(" ", "_")
+
+    if location_key not in HOTEL_DATA:
+        return {
+            "error": f"No hotels found for location: {location}. Available locations: {', '.join(HOTEL_DATA.keys())}"
+        }
+
+    available_hotels = _select_available(location_key, max_price, _COMPACT_AVAILABLE, _COMPACT_PRICE_SORTED)
+
+    return {
+        "location": location,
+        "total_available": len(available_hotels),
+        "amenity_legend": AMENITY_VOCAB,
+        "hotels": available_hotels
+    }
+
+
+def _select_available(location_key: str, max_price, by_location: dict, price_sorted: dict) -> list:
+    # Pick from records parallel to AVAILABLE_BY_LOCATION / PRICE_SORTED
+    if max_price is None:
+        return list(by_location[location_key])
+    cutoff = bisect.bisect_right(_SORTED_PRICES[location_key], max_price)
+    return price_sorted[location_key][:cutoff]
+
+
+@tool
+def get_hotel_details(location: str, hotel_name: str) -> Dict[str, Any]:
+    """
+    Get detailed information about a specific hotel.
+
+    Args:
+        location: The city/location of the hotel
+        hotel_name: The name of the hotel
+
+    Returns:
+        Detailed hotel information
+    """
+    location_key = location.lower().replace(" ", "_")
+
+    if location_key not in HOTEL_DATA:
+        return {"error": f"Location '{location}' not found"}
+
+    hotel = HOTEL_NAME_INDEX[location_key].get(hotel_name.lower())
+    if hotel is not None:
+        return {
+            "location": location,
+            "hotel_details": hotel,
+            "estimated_weekly_cost": hotel["price_per_night"] * 7,
+            "estimated_monthly_cost": hotel["price_per_night"] * 30
+        }
+
+    return {"error": f"Hotel '{hotel_name}' not found in {location}"}
+
+
+@tool
+def calculate_booking_cost(price_per_night: int, nights: int, tax_rate: float = 0.12) -> Dict[str, float]:
+    """
+    Calculate the total cost of a hotel booking including taxes.
+
+    Args:
+        price_per_night: Price per night in USD
+        nights: Number of nights
+        tax_rate: Tax rate (default 12%)
+
+    Returns:
+        Breakdown of booking costs
+    """
+    subtotal = price_per_night * nights
+    tax = subtotal * tax_rate
+    total = subtotal + tax
+
+    return {
+        "price_per_night": price_per_night,
+        "nights": nights,
+        "subtotal": subtotal,
+        "tax": round(tax, 2),
+        "total_cost": round(total, 2)
+    }
+
+
+@tool
+def get_available_locations() -> List[str]:
+    """
+    Get all available booking locations.
+
+    Returns:
+        List of available cities/locations
+    """
+    return {
+        "available_locations": list(HOTEL_DATA.keys()),
+        "total_locations": len(HOTEL_DATA)
+    }
+
+
+# Define tools list
+tools = [search_hotels, get_hotel_details, calculate_booking_cost, get_available_locations]
+
+# OpenAI-format tool schemas, generated once and reused for every bind
+TOOL_SCHEMAS = [convert_to_openai_tool(t) for t in tools]
+
+# Map tool call names to their tool functions
+TOOL_MAP = {
+    "search_hotels": search_hotels,
+    "get_hotel_details": get_hotel_details,
+    "calculate_booking_cost": calculate_booking_cost,
+    "get_available_locations": get_available_locations
+}
+
+
+def dump_tool_output(tool_output: Any) -> str:
+    """
+    Serialize a tool result as compact JSON for a ToolMessage.
+
+    Args:
+        tool_output: The value returned by a tool
+
+    Returns:
+        JSON string of the tool output
+    """
+    return orjson.dumps(tool_output, option=orjson.OPT_NON_STR_KEYS).decode()
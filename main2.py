@@ -1,300 +1,237 @@
-import os
-from langchain.chat_models import init_chat_model
-from langchain.schema import HumanMessage
-from langchain_core.tools import tool
-from langchain_core.messages import HumanMessage, ToolMessage
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
-
-# Sample hotel data for 5 locations
-HOTEL_DATA = {
-    "new_york": [
-        {
-            "name": "The Plaza Hotel",
-            "rating": 4.5,
-            "price_per_night": 450,
-            "amenities": ["WiFi", "Pool", "Spa", "Gym", "Restaurant"],
-            "availability": True
-        },
-        {
-            "name": "The Standard High Line",
-            "rating": 4.2,
-            "price_per_night": 320,
-            "amenities": ["WiFi", "Bar", "Gym", "Pet-friendly"],
-            "availability": True
-        },
-        {
-            "name": "Pod Hotel Brooklyn",
-            "rating": 4.0,
-            "price_per_night": 180,
-            "amenities": ["WiFi", "Restaurant", "Rooftop Bar"],
-            "availability": False
-        }
-    ],
-    "paris": [
-        {
-            "name": "Hotel Plaza Athenee",
-            "rating": 4.8,
-            "price_per_night": 680,
-            "amenities": ["WiFi", "Spa", "Restaurant", "Concierge", "Bar"],
-            "availability": True
-        },
-        {
-            "name": "Le Marais Hotel",
-            "rating": 4.1,
-            "price_per_night": 280,
-            "amenities": ["WiFi", "Restaurant", "Historic Building"],
-            "availability": True
-        },
-        {
-            "name": "Hotel des Grands Boulevards",
-            "rating": 4.3,
-            "price_per_night": 350,
-            "amenities": ["WiFi", "Restaurant", "Bar", "Garden"],
-            "availability": True
-        }
-    ],
-    "tokyo": [
-        {
-            "name": "The Ritz-Carlton Tokyo",
-            "rating": 4.7,
-            "price_per_night": 520,
-            "amenities": ["WiFi", "Spa", "Pool", "Multiple Restaurants", "City View"],
-            "availability": True
-        },
-        {
-            "name": "Shibuya Excel Hotel Tokyu",
-            "rating": 4.2,
-            "price_per_night": 290,
-            "amenities": ["WiFi", "Restaurant", "City Center", "Shopping Access"],
-            "availability": True
-        },
-        {
-            "name": "Capsule Hotel Shinjuku 510",
-            "rating": 3.8,
-            "price_per_night": 80,
-            "amenities": ["WiFi", "Shared Bath", "Lockers"],
-            "availability": False
-        }
-    ],
-    "london": [
-        {
-            "name": "The Savoy",
-            "rating": 4.6,
-            "price_per_night": 590,
-            "amenities": ["WiFi", "Spa", "Multiple Restaurants", "Theatre District", "River View"],
-            "availability": True
-        },
-        {
-            "name": "Premier Inn London City",
-            "rating": 4.0,
-            "price_per_night": 120,
-            "amenities": ["WiFi", "Restaurant", "24/7 Reception"],
-            "availability": True
-        },
-        {
-            "name": "The Zetter Townhouse",
-            "rating": 4.4,
-            "price_per_night": 380,
-            "amenities": ["WiFi", "Bar", "Boutique Style", "Historic"],
-            "availability": True
-        }
-    ],
-    "dubai": [
-        {
-            "name": "Burj Al Arab Jumeirah",
-            "rating": 4.9,
-            "price_per_night": 1200,
-            "amenities": ["WiFi", "Multiple Pools", "Spa", "Private Beach", "Butler Service"],
-            "availability": True
-        },
-        {
-            "name": "Atlantis The Palm",
-            "rating": 4.5,
-            "price_per_night": 480,
-            "amenities": ["WiFi", "Water Park", "Aquarium", "Multiple Restaurants", "Beach"],
-            "availability": True
-        },
-        {
-            "name": "Rove Downtown Dubai",
-            "rating": 4.1,
-            "price_per_night": 150,
-            "amenities": ["WiFi", "Pool", "Gym", "Restaurant", "City Center"],
-            "availability": False
-        }
-    ]
-}
-
-
-def get_llm():
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise EnvironmentError("OPENAI_API_KEY not set.")
-    return init_chat_model("openai:gpt-4.1")
+import re
+import asyncio
+import functools
+from collections import OrderedDict
+from typing import AsyncIterator, List
+from hotel_tools import (
+    TOOL_MAP, TOOL_SCHEMAS, calculate_booking_cost, get_available_locations, get_llm, dump_tool_output
+)
+
+# Responses for normalized queries, so exact repeats skip the LLM and tools
+_RESPONSE_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_RESPONSE_CACHE_SIZE = 256
+
+
+def _booking_cost_args(match):
+    # Only whole-dollar prices route directly; anything else is left to the LLM
+    if match.group("cents") and int(match.group("cents")):
+        return None
+    return {
+        "price_per_night": int(match.group("price").replace(",", "")),
+        "nights": int(match.group("nights"))
+    }
 
 
-@tool
-def search_hotels(location: str, max_price: int = None) -> List[Dict[str, Any]]:
+# Queries answerable by a single tool call, routed without an LLM round-trip.
+# Each route maps a precompiled pattern to a tool and a match -> args builder
+# that may return None to fall back to the LLM. Patterns must match the whole
+# query so multi-part questions still reach the LLM.
+_FAST_ROUTES = [
+    (
+        re.compile(
+            r"(?:(?:what|which)\s+are\s+|(?:show|list|give)\s+(?:me\s+)?)?"
+            r"(?:all\s+)?(?:of\s+)?(?:the\s+)?available\s+(?:booking\s+)?locations\s*[?.!]?",
+            re.I
+        ),
+        get_available_locations,
+        lambda match: {}
+    ),
+    (
+        re.compile(
+            r"(?:(?:what(?:'s|\s+is|\s+would\s+be)|calculate)\s+the\s+)?(?:total\s+)?cost\s+(?:of|for)\s+"
+            r"(?:a\s+)?\$\s*(?P<price>\d{1,3}(?:,\d{3})+|\d+)(?:\.(?P<cents>\d{1,2}))?"
+            r"(?:\s*(?:per|a|/)\s*night)?(?:\s+(?:hotel|room))?"
+            r"\s+for\s+(?P<nights>\d+)\s+nights?\s*[?.!]?",
+            re.I
+        ),
+        calculate_booking_cost,
+        _booking_cost_args
+    )
+]
+
+
+@functools.lru_cache(maxsize=1)
+def _get_bound_llm():
+    # Build the client and serialize the tool schemas once per process
+    return get_llm().bind(tools=TOOL_SCHEMAS, tool_choice="auto")
+
+
+async def process_hotel_query(query: str) -> str:
     """
-    Search for available hotels in a specific location.
+    Process a hotel-related query and return a string response.
 
     Args:
-        location: The city/location to search for hotels (e.g., 'new_york', 'paris', 'tokyo', 'london', 'dubai')
-        max_price: Optional maximum price per night filter
+        query: The hotel-related question or request
 
     Returns:
-        List of available hotels with details
+        String response with hotel information
     """
-    location_key = location.lower().replace(" ", "_")
-
-    if location_key not in HOTEL_DATA:
-        return {
-            "error": f"No hotels found for location: {location}. Available locations: {', '.join(HOTEL_DATA.keys())}"
-        }
-
-    hotels = HOTEL_DATA[location_key]
-    available_hotels = [hotel for hotel in hotels if hotel["availability"]]
+    try:
+        fast_response = _fast_route(query)
+        if fast_response is not None:
+            return fast_response
 
-    if max_price is not None:
-        available_hotels = [hotel for hotel in available_hotels if hotel["price_per_night"] <= max_price]
+        return "".join([chunk async for chunk in _answer_chunks(query.strip(), stream=False)])
 
-    return {
-        "location": location,
-        "total_available": len(available_hotels),
-        "hotels": available_hotels
-    }
+    except Exception as e:
+        return f"Error processing query: {str(e)}"
 
 
-@tool
-def get_hotel_details(location: str, hotel_name: str) -> Dict[str, Any]:
+async def process_hotel_query_stream(query: str) -> AsyncIterator[str]:
     """
-    Get detailed information about a specific hotel.
+    Process a hotel-related query, yielding the response as it is generated.
+
+    Tool results are yielded as soon as the tools finish, followed by the
+    final AI response token by token. The streamed call bypasses the LLM
+    completion cache, which only applies to invoke; use process_hotel_query
+    when the response is not needed incrementally.
 
     Args:
-        location: The city/location of the hotel
-        hotel_name: The name of the hotel
+        query: The hotel-related question or request
 
-    Returns:
-        Detailed hotel information
+    Yields:
+        Pieces of the string response with hotel information
     """
-    location_key = location.lower().replace(" ", "_")
-
-    if location_key not in HOTEL_DATA:
-        return {"error": f"Location '{location}' not found"}
+    started = False
+    try:
+        fast_response = _fast_route(query)
+        if fast_response is not None:
+            yield fast_response
+            return
 
-    hotels = HOTEL_DATA[location_key]
-    for hotel in hotels:
-        if hotel["name"].lower() == hotel_name.lower():
-            return {
-                "location": location,
-                "hotel_details": hotel,
-                "estimated_weekly_cost": hotel["price_per_night"] * 7,
-                "estimated_monthly_cost": hotel["price_per_night"] * 30
-            }
+        async for chunk in _answer_chunks(query.strip(), stream=True):
+            started = True
+            yield chunk
 
-    return {"error": f"Hotel '{hotel_name}' not found in {location}"}
+    except Exception as e:
+        # Keep the error apart from any partial output already yielded
+        yield ("\n\n" if started else "") + f"Error processing query: {str(e)}"
 
 
-@tool
-def calculate_booking_cost(price_per_night: int, nights: int, tax_rate: float = 0.12) -> Dict[str, float]:
+def process_hotel_query_sync(query: str) -> str:
     """
-    Calculate the total cost of a hotel booking including taxes.
+    Blocking wrapper around process_hotel_query for synchronous callers.
 
     Args:
-        price_per_night: Price per night in USD
-        nights: Number of nights
-        tax_rate: Tax rate (default 12%)
+        query: The hotel-related question or request
 
     Returns:
-        Breakdown of booking costs
+        String response with hotel information
     """
-    subtotal = price_per_night * nights
-    tax = subtotal * tax_rate
-    total = subtotal + tax
+    return asyncio.run(process_hotel_query(query))
 
-    return {
-        "price_per_night": price_per_night,
-        "nights": nights,
-        "subtotal": subtotal,
-        "tax": round(tax, 2),
-        "total_cost": round(total, 2)
-    }
 
-
-@tool
-def get_available_locations() -> List[str]:
-    """
-    Get all available booking locations.
-
-    Returns:
-        List of available cities/locations
+async def process_hotel_queries(queries: List[str]) -> List[str]:
     """
-    return {
-        "available_locations": list(HOTEL_DATA.keys()),
-        "total_locations": len(HOTEL_DATA)
-    }
+    Process several hotel-related queries concurrently.
 
-
-# Define tools list
-tools = [search_hotels, get_hotel_details, calculate_booking_cost, get_available_locations]
-
-
-def process_hotel_query(query: str) -> str:
-    """
-    Process a hotel-related query and return a string response.
+    Each query goes through process_hotel_query, so routing, caching and
+    error handling match the single-query path.
 
     Args:
-        query: The hotel-related question or request
+        queries: The hotel-related questions or requests
 
     Returns:
-        String response with hotel information
+        String responses in the same order as the queries
     """
-    try:
-        llm = get_llm()
-        llm_with_tools = llm.bind_tools(tools)
-
-        messages = [HumanMessage(query)]
-        ai_msg = llm_with_tools.invoke(messages)
-
-        # Process tool calls if any
-        if hasattr(ai_msg, 'tool_calls') and ai_msg.tool_calls:
-            results = []
-
-            for tool_call in ai_msg.tool_calls:
-                # Find the corresponding tool function
-                tool_map = {
-                    "search_hotels": search_hotels,
-                    "get_hotel_details": get_hotel_details,
-                    "calculate_booking_cost": calculate_booking_cost,
-                    "get_available_locations": get_available_locations
-                }
-
-                selected_tool = tool_map.get(tool_call["name"].lower())
-                if selected_tool:
-                    tool_output = selected_tool.invoke(tool_call["args"])
-                    results.append(f"Tool: {tool_call['name']}\nResult: {tool_output}")
-                    messages.append(ToolMessage(str(tool_output), tool_call_id=tool_call["id"]))
-
-            # Get final AI response after tool execution
-            final_response = llm_with_tools.invoke(messages)
-
-            # Combine tool results with AI response
-            response_parts = []
-            if results:
-                response_parts.extend(results)
-            if hasattr(final_response, 'content') and final_response.content:
-                response_parts.append(f"AI Response: {final_response.content}")
-
-            return "\n\n".join(response_parts)
-        else:
-            # Return direct AI response if no tools were called
-            return ai_msg.content if hasattr(ai_msg, 'content') else str(ai_msg)
+    return list(await asyncio.gather(*[process_hotel_query(query) for query in queries]))
+
+
+async def _answer_chunks(query: str, stream: bool) -> AsyncIterator[str]:
+    # Errors propagate to the caller and are never cached.
+    # The lowercased query is only the cache key; the LLM sees it as written.
+    from langchain_core.messages import HumanMessage
+
+    cache_key = query.lower()
+    if cache_key in _RESPONSE_CACHE:
+        _RESPONSE_CACHE.move_to_end(cache_key)
+        yield _RESPONSE_CACHE[cache_key]
+        return
+
+    llm_with_tools = _get_bound_llm()
+
+    messages = [HumanMessage(query)]
+    ai_msg = await llm_with_tools.ainvoke(messages)
+
+    if not _has_tool_calls(ai_msg):
+        # Return direct AI response if no tools were called
+        chunks = [ai_msg.content if hasattr(ai_msg, 'content') else str(ai_msg)]
+        yield chunks[0]
+    else:
+        results = await _run_tool_calls(messages, ai_msg)
+        chunks = []
+        if results:
+            chunks.append("\n\n".join(results))
+            yield chunks[-1]
+
+        # Get final AI response after tool execution
+        answer_started = False
+        async for content in _final_answer(llm_with_tools, messages, stream):
+            if not content:
+                continue
+            if not answer_started:
+                answer_started = True
+                chunks.append(("\n\n" if results else "") + "AI Response: ")
+                yield chunks[-1]
+            chunks.append(content)
+            yield chunks[-1]
+
+    _RESPONSE_CACHE[cache_key] = "".join(chunks)
+    if len(_RESPONSE_CACHE) > _RESPONSE_CACHE_SIZE:
+        _RESPONSE_CACHE.popitem(last=False)
+
+
+async def _final_answer(llm_with_tools, messages: list, stream: bool) -> AsyncIterator[str]:
+    # astream skips the LLM completion cache, so only stream when asked to
+    if stream:
+        async for message_chunk in llm_with_tools.astream(messages):
+            yield message_chunk.content
+    else:
+        final_response = await llm_with_tools.ainvoke(messages)
+        yield final_response.content
+
+
+def _fast_route(query: str):
+    # Return the formatted tool result for a routable query, otherwise None
+    for pattern, selected_tool, build_args in _FAST_ROUTES:
+        match = pattern.fullmatch(query.strip())
+        if match:
+            args = build_args(match)
+            if args is None:
+                return None
+            tool_output = selected_tool.invoke(args)
+            return f"Tool: {selected_tool.name}\nResult: {tool_output}"
+    return None
+
+
+def _has_tool_calls(ai_msg) -> bool:
+    return bool(getattr(ai_msg, 'tool_calls', None))
+
+
+async def _run_tool_calls(messages: list, ai_msg) -> List[str]:
+    # Execute the tool calls in ai_msg and extend messages with the transcript
+    from langchain_core.messages import ToolMessage
+
+    results = []
+    messages.append(ai_msg)
+    tool_calls = [
+        tool_call for tool_call in ai_msg.tool_calls
+        if tool_call["name"].lower() in TOOL_MAP
+    ]
+    tool_outputs = await asyncio.gather(*[
+        asyncio.to_thread(TOOL_MAP[tool_call["name"].lower()].invoke, tool_call["args"])
+        for tool_call in tool_calls
+    ])
 
-    except Exception as e:
-        return f"Error processing query: {str(e)}"
+    # gather preserves call order so the transcript stays deterministic
+    for tool_call, tool_output in zip(tool_calls, tool_outputs):
+        results.append(f"Tool: {tool_call['name']}\nResult: {tool_output}")
+        messages.append(ToolMessage(dump_tool_output(tool_output), tool_call_id=tool_call["id"]))
 
+    return results
 
-def main():
+
+async def _amain():
     try:
         print("Hotel Booking LLM System")
         print("=" * 50)
@@ -310,12 +247,12 @@ def main():
         print("Testing process_hotel_query function:")
         print("=" * 50)
 
-        for i, query in enumerate(test_queries, 1):
+        # Run all test queries concurrently
+        responses = await process_hotel_queries(test_queries)
+
+        for i, (query, response) in enumerate(zip(test_queries, responses), 1):
             print(f"\nQuery {i}: {query}")
             print("-" * 40)
-
-            # Use the new function
-            response = process_hotel_query(query)
             print(response)
             print("=" * 50)
 
@@ -323,16 +260,22 @@ def main():
         print("\nProgrammatic Usage Example:")
         print("-" * 30)
         user_query = "What's the cheapest hotel in Paris?"
-        result = process_hotel_query(user_query)
         print(f"Query: {user_query}")
-        print(f"Response: {result}")
+        print("Response: ", end="", flush=True)
+        async for chunk in process_hotel_query_stream(user_query):
+            print(chunk, end="", flush=True)
+        print()
 
     except Exception as e:
         print(f"Error: {e}")
         print("\nTo run this program, make sure to:")
         print("1. Set your OPENAI_API_KEY environment variable")
-        print("2. Install required packages: pip install langchain langchain-openai")
+        print("2. Install required packages: pip install langchain langchain-openai langchain-community orjson")
+
+
+def main():
+    asyncio.run(_amain())
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()